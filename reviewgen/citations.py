@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from itertools import cycle, islice
 from pathlib import Path
 from typing import Dict, List, Sequence
 
@@ -17,18 +18,11 @@ def map_sources(paths: Sequence[Path | str]) -> Dict[str, str]:
 
 def rotate_citations(mapping: Dict[str, str], count: int) -> List[str]:
     """Return a list of labels to be attached to sections in a round-robin way."""
-    labels = list(mapping.keys())
-    if not labels:
+    if not mapping:
         return []
-    result: List[str] = []
-    for i in range(count):
-        result.append(labels[i % len(labels)])
-    return result
+    return list(islice(cycle(mapping), count))
 
 
 def format_references(mapping: Dict[str, str]) -> str:
     """Format reference list."""
-    lines = []
-    for label, name in mapping.items():
-        lines.append(f"{label} {name}")
-    return "\n".join(lines)
+    return "\n".join(f"{label} {name}" for label, name in mapping.items())
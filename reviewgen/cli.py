@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import logging
 from pathlib import Path
 from typing import List
 
 from .config import ReviewConfig
-from .generator import plan_and_generate
-from .preprocess import preprocess_sources
 
 
 def parse_args(argv: List[str] | None = None) -> ReviewConfig:
@@ -34,6 +33,12 @@ def parse_args(argv: List[str] | None = None) -> ReviewConfig:
     parser.add_argument("--llm-model", dest="llm_model", default=None, help="LLM model name (provider-specific)")
     parser.add_argument("--llm-token", dest="llm_token", default=None, help="LLM token/api key (optional)")
     parser.add_argument("--llm-timeout", dest="llm_timeout", type=int, default=8, help="LLM request timeout (seconds)")
+    parser.add_argument(
+        "--no-cache", dest="no_cache", action="store_true", help="Do not reuse cached LLM responses"
+    )
+    parser.add_argument(
+        "--log-level", dest="log_level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="WARNING"
+    )
     args = parser.parse_args(argv)
 
     keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
@@ -53,12 +58,18 @@ def parse_args(argv: List[str] | None = None) -> ReviewConfig:
         llm_model=args.llm_model,
         llm_token=args.llm_token,
         llm_timeout=args.llm_timeout,
+        llm_cache=not args.no_cache,
+        log_level=args.log_level,
     )
     cfg.validate()
     return cfg
 
 
 def run(cfg: ReviewConfig) -> str:
+    # Imported here so `--help` and argument errors do not load jinja2/requests.
+    from .generator import plan_and_generate
+    from .preprocess import preprocess_sources
+
     segments, unique_texts, source_names = preprocess_sources(cfg.sources)
     sources_used = unique_texts if unique_texts else []
     llm_client = None
@@ -66,7 +77,12 @@ def run(cfg: ReviewConfig) -> str:
         from .llm import build_llm_client
 
         llm_client = build_llm_client(
-            cfg.llm, endpoint=cfg.llm_endpoint, model=cfg.llm_model, token=cfg.llm_token, timeout=cfg.llm_timeout
+            cfg.llm,
+            endpoint=cfg.llm_endpoint,
+            model=cfg.llm_model,
+            token=cfg.llm_token,
+            timeout=cfg.llm_timeout,
+            cache=cfg.llm_cache,
         )
     content = plan_and_generate(
         topic=cfg.topic,
@@ -88,6 +104,7 @@ def run(cfg: ReviewConfig) -> str:
 
 def main() -> None:
     cfg = parse_args()
+    logging.basicConfig(level=cfg.log_level)
     markdown = run(cfg)
     print(markdown)
 
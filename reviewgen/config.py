@@ -23,6 +23,8 @@ class ReviewConfig:
     llm_model: Optional[str] = None
     llm_token: Optional[str] = None
     llm_timeout: int = 8
+    llm_cache: bool = True
+    log_level: str = "WARNING"
 
     def validate(self) -> None:
         """Validate basic fields."""
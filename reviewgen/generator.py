@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime as _dt
-from typing import Dict, List, Sequence
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from jinja2 import Template
+from jinja2 import Environment
 
 from .citations import format_references, map_sources, rotate_citations
 from .outline import generate_outline
@@ -13,10 +18,90 @@ from .preprocess import extract_keywords
 from .utils import wrap_paragraph
 from .llm import LLMClient, LocalRuleLLM
 
+_MAX_PARALLEL_SECTIONS = 8
+_PARAGRAPH_MAX_TOKENS = 180
+
+_REVIEW_TEMPLATE_SRC = """# {{ topic }} — Review
+_Audience_: {{ audience }} | _Length target_: {{ length }} words | _Mode_: {{ mode }} | _Date_: {{ now }} | _Lang_: {{ lang }}
+
+{% for title, bullets, paragraph in sections %}
+
+## {{ title }}
+
+{% for b in bullets %}
+- {{ b }}
+{% endfor %}
+
+{{ paragraph | wrap }}
+
+{% endfor %}
+
+{% if references %}
+
+## References
+{{ references }}
+{% else %}
+
+**未使用外部资料 / No external sources used.**
+{% endif %}
+"""
+
+# Shared environment: templates are compiled once at import and reused across calls.
+_ENV = Environment(trim_blocks=True, lstrip_blocks=True, auto_reload=False, cache_size=400)
+_ENV.filters["wrap"] = wrap_paragraph
+_REVIEW_TEMPLATE = _ENV.from_string(_REVIEW_TEMPLATE_SRC)
 
-def _build_section(title: str, bullets: List[str], paragraph: str) -> str:
-    bullet_block = "\n".join(f"- {b}" for b in bullets)
-    return f"## {title}\n\n{bullet_block}\n\n{wrap_paragraph(paragraph)}\n"
+
+def _review_plan(
+    outline: List[str], keywords: List[str], sources: Sequence[str], source_names: Sequence[str] | None
+) -> Tuple[Dict[str, str], List[str], List[str]]:
+    """Citation mapping, per-section citation labels and effective keywords."""
+    if source_names:
+        mapping = map_sources(source_names)
+    elif sources:
+        mapping = map_sources([f"Source_{i}" for i, _ in enumerate(sources, start=1)])
+    else:
+        mapping = {}
+    citation_labels = rotate_citations(mapping, max(len(outline), 1))
+    labels = [citation_labels[idx] if idx < len(citation_labels) else "" for idx in range(len(outline))]
+
+    # Fallback keywords if none provided and no sources.
+    all_keywords = keywords or extract_keywords(list(sources))
+    return mapping, labels, all_keywords
+
+
+def _review_context(
+    *,
+    topic: str,
+    audience: str,
+    length: int,
+    mode: str,
+    lang: str,
+    outline: List[str],
+    labels: List[str],
+    keywords: List[str],
+    paragraphs: Iterable[str],
+    mapping: Dict[str, str],
+) -> Dict[str, object]:
+    """Template variables; ``sections`` is lazy so paragraphs may still be in flight."""
+    sections = (
+        (title, _build_bullets(title, topic, keywords, label, lang), paragraph)
+        for title, label, paragraph in zip(outline, labels, paragraphs)
+    )
+    return {
+        "topic": topic,
+        "audience": audience,
+        "length": length,
+        "mode": mode,
+        "now": _dt.date.today().isoformat(),
+        "lang": lang,
+        "sections": sections,
+        "references": format_references(mapping) if mapping else "",
+    }
+
+
+def _render_review(**kwargs) -> str:
+    return _REVIEW_TEMPLATE.render(_review_context(**kwargs))
 
 
 def generate_review(
@@ -33,54 +118,129 @@ def generate_review(
     llm_client: LLMClient | None = None,
 ) -> str:
     """Generate the review markdown."""
-    if source_names:
-        mapping = map_sources(source_names)
-    elif sources:
-        mapping = map_sources([f"Source_{i}" for i, _ in enumerate(sources, start=1)])
+    mapping, labels, all_keywords = _review_plan(outline, keywords, sources, source_names)
+    client = llm_client or LocalRuleLLM()
+    prompts = _section_prompts(outline, labels, topic, audience, all_keywords, lang)
+
+    if isinstance(client, LocalRuleLLM):
+        outcomes = list(_inline_outcomes(client, prompts))
     else:
-        mapping = {}
-    citation_labels = rotate_citations(mapping, max(len(outline), 1))
-    now = _dt.date.today().isoformat()
+        # Remote calls are latency-bound: issue one request per section concurrently,
+        # within REVIEWGEN_MAX_CONCURRENT / REVIEWGEN_MAX_QPM.
+        outcomes = list(_threaded_outcomes(client, prompts, None))
 
-    # Fallback keywords if none provided and no sources.
-    auto_keywords = extract_keywords(list(sources)) if not keywords else keywords
-    all_keywords = keywords or auto_keywords
+    return _render_review(
+        topic=topic,
+        audience=audience,
+        length=length,
+        mode=mode,
+        lang=lang,
+        outline=outline,
+        labels=labels,
+        keywords=all_keywords,
+        paragraphs=list(_section_paragraphs(outcomes, outline, labels, topic, audience, all_keywords, lang)),
+        mapping=mapping,
+    )
 
-    template = Template(
-        """# {{ topic }} — Review
-_Audience_: {{ audience }} | _Length target_: {{ length }} words | _Mode_: {{ mode }} | _Date_: {{ now }} | _Lang_: {{ lang }}
 
-{% for sec in sections %}
-{{ sec }}
-{% endfor %}
-{% if references %}
-## References
-{{ references }}
-{% else %}
-**未使用外部资料 / No external sources used.**
-{% endif %}
-"""
+def stream_review(
+    *,
+    topic: str,
+    audience: str,
+    length: int,
+    mode: str,
+    keywords: List[str],
+    outline: List[str],
+    sources: Sequence[str],
+    source_names: Sequence[str] | None,
+    lang: str,
+    llm_client: LLMClient | None = None,
+    call_timeout: float | None = None,
+    fallbacks: List[str] | None = None,
+) -> Iterator[str]:
+    """Yield the review markdown in pieces, each section as soon as its paragraph is ready.
+
+    The concatenated output equals ``generate_review``. Remote calls share the
+    process-wide call limiter, and ``call_timeout``/``fallbacks`` behave as in
+    ``agenerate_review``.
+    """
+    mapping, labels, all_keywords = _review_plan(outline, keywords, sources, source_names)
+    client = llm_client or LocalRuleLLM()
+    prompts = _section_prompts(outline, labels, topic, audience, all_keywords, lang)
+
+    if isinstance(client, LocalRuleLLM):
+        outcomes = _inline_outcomes(client, prompts)
+    else:
+        outcomes = _threaded_outcomes(client, prompts, call_timeout)
+    paragraphs = _section_paragraphs(outcomes, outline, labels, topic, audience, all_keywords, lang, fallbacks)
+    context = _review_context(
+        topic=topic,
+        audience=audience,
+        length=length,
+        mode=mode,
+        lang=lang,
+        outline=outline,
+        labels=labels,
+        keywords=all_keywords,
+        paragraphs=paragraphs,
+        mapping=mapping,
     )
+    # Closing the stream (e.g. client disconnect) also stops the pending section calls.
+    with closing(outcomes):
+        yield from _REVIEW_TEMPLATE.generate(context)
 
-    sections: List[str] = []
-    for idx, title in enumerate(outline):
-        label = citation_labels[idx] if idx < len(citation_labels) else ""
-        bullets = _build_bullets(title, topic, all_keywords, label, lang)
-        paragraph = _build_paragraph(
-            title, topic, audience, all_keywords, label, lang, llm_client=llm_client or LocalRuleLLM()
-        )
-        sections.append(_build_section(title, bullets, paragraph))
 
-    references = format_references(mapping) if mapping else ""
-    return template.render(
+async def agenerate_review(
+    *,
+    topic: str,
+    audience: str,
+    length: int,
+    mode: str,
+    keywords: List[str],
+    outline: List[str],
+    sources: Sequence[str],
+    source_names: Sequence[str] | None,
+    lang: str,
+    llm_client: LLMClient | None = None,
+    call_timeout: float | None = None,
+    fallbacks: List[str] | None = None,
+) -> str:
+    """Async variant of ``generate_review``: section paragraphs are awaited concurrently.
+
+    ``call_timeout`` bounds each LLM call; sections that time out use the rule-based paragraph.
+    Titles of sections whose LLM call failed are appended to ``fallbacks`` when given.
+    """
+    mapping, labels, all_keywords = _review_plan(outline, keywords, sources, source_names)
+    client = llm_client or LocalRuleLLM()
+    prompts = _section_prompts(outline, labels, topic, audience, all_keywords, lang)
+
+    if isinstance(client, LocalRuleLLM):
+        outcomes = list(_inline_outcomes(client, prompts))
+    else:
+        ex = ThreadPoolExecutor(max_workers=max(1, min(_MAX_PARALLEL_SECTIONS, len(outline))))
+        try:
+            outcomes = await asyncio.gather(
+                *(
+                    client.agenerate(prompt, max_tokens=_PARAGRAPH_MAX_TOKENS, timeout=call_timeout, executor=ex)
+                    for prompt in prompts
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            # Don't wait for calls abandoned after call_timeout; they end at the HTTP timeout.
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    return _render_review(
         topic=topic,
         audience=audience,
         length=length,
         mode=mode,
-        now=now,
         lang=lang,
-        sections=sections,
-        references=references,
+        outline=outline,
+        labels=labels,
+        keywords=all_keywords,
+        paragraphs=list(_section_paragraphs(outcomes, outline, labels, topic, audience, all_keywords, lang, fallbacks)),
+        mapping=mapping,
     )
 
 
@@ -101,34 +261,85 @@ def _build_bullets(title: str, topic: str, keywords: List[str], label: str, lang
     ]
 
 
-def _build_paragraph(
-    title: str,
-    topic: str,
-    audience: str,
-    keywords: List[str],
-    label: str,
-    lang: str,
-    llm_client: LLMClient,
-) -> str:
-    """Craft a paragraph using LLM client if provided; fallback to rule-based template."""
-    base_prompt = (
+def _paragraph_prompt(title: str, topic: str, audience: str, keywords: List[str], label: str, lang: str) -> str:
+    return (
         f"Write a concise paragraph (~120 words) for a literature review section.\n"
         f"Section: {title}\nTopic: {topic}\nAudience: {audience}\nKeywords: {', '.join(keywords[:8]) or topic}\n"
         f"Language: {'Chinese' if lang == 'zh' else 'English'}\n"
         f"Include citation marker if provided: {label or 'None'}\n"
         "Emphasize evolution, representative work, applications, and open issues.\n"
     )
+
+
+def _section_prompts(
+    outline: List[str], labels: List[str], topic: str, audience: str, keywords: List[str], lang: str
+) -> List[str]:
+    return [_paragraph_prompt(title, topic, audience, keywords, label, lang) for title, label in zip(outline, labels)]
+
+
+def _outcome(call: Callable[[], str]) -> str | Exception:
+    """Run an LLM call, returning its exception instead of raising it."""
+    try:
+        return call()
+    except Exception as exc:
+        return exc
+
+
+def _inline_outcomes(client: LLMClient, prompts: Iterable[str]) -> Iterator[str | Exception]:
+    """Section calls made one after another in the calling thread."""
+    for prompt in prompts:
+        yield _outcome(partial(client.generate, prompt, max_tokens=_PARAGRAPH_MAX_TOKENS))
+
+
+def _threaded_outcomes(
+    client: LLMClient, prompts: Sequence[str], timeout: float | None
+) -> Iterator[str | Exception]:
+    """Section calls run concurrently under the call limiter, yielded in prompt order.
+
+    Calls not finished ``timeout`` seconds after the start yield TimeoutError.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    ex = ThreadPoolExecutor(max_workers=max(1, min(_MAX_PARALLEL_SECTIONS, len(prompts))))
     try:
-        text = llm_client.generate(base_prompt, max_tokens=180)
-        if text:
-            return text
-    except Exception:
-        # Fall back silently.
-        pass
-    return _fallback_paragraph(title, topic, audience, keywords, label, lang)
+        futures = [
+            ex.submit(client.generate_limited, prompt, _PARAGRAPH_MAX_TOKENS, deadline=deadline) for prompt in prompts
+        ]
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            yield _outcome(partial(future.result, remaining))
+    finally:
+        # Calls not yet started are dropped and calls past the deadline are not waited for.
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _section_paragraphs(
+    outcomes: Iterable[str | BaseException],
+    outline: List[str],
+    labels: List[str],
+    topic: str,
+    audience: str,
+    keywords: List[str],
+    lang: str,
+    fallbacks: List[str] | None = None,
+) -> Iterator[str]:
+    """Turn each section's LLM outcome into its paragraph.
+
+    Failed or empty calls fall back silently to the rule-based paragraph; their
+    titles are appended to ``fallbacks`` when given.
+    """
+    for outcome, title, label in zip(outcomes, outline, labels):
+        if isinstance(outcome, str) and outcome:
+            yield outcome
+            continue
+        if fallbacks is not None:
+            fallbacks.append(title)
+        yield _fallback_paragraph(title, topic, audience, tuple(keywords[:5]), label, lang)
 
 
-def _fallback_paragraph(title: str, topic: str, audience: str, keywords: List[str], label: str, lang: str) -> str:
+@lru_cache(maxsize=256)
+def _fallback_paragraph(
+    title: str, topic: str, audience: str, keywords: Tuple[str, ...], label: str, lang: str
+) -> str:
     """Rule-based paragraph used when LLM generation fails or is skipped."""
     kws = ", ".join(keywords[:5]) if keywords else topic
     citation = f" ({label})" if label else ""
@@ -172,3 +383,36 @@ def plan_and_generate(
         lang=lang,
         llm_client=llm_client,
     )
+
+
+async def aplan_and_generate(
+    *,
+    topic: str,
+    audience: str,
+    length: int,
+    mode: str,
+    keywords: List[str],
+    custom_outline: str | None,
+    sources: Sequence[str],
+    source_names: Sequence[str] | None,
+    lang: str,
+    llm_client: LLMClient | None = None,
+    call_timeout: float | None = None,
+    fallbacks: List[str] | None = None,
+) -> str:
+    """Async entry point mirroring ``plan_and_generate``; see ``agenerate_review`` for the options."""
+    outline = generate_outline(mode, topic, keywords, custom_outline)
+    return await agenerate_review(
+        topic=topic,
+        audience=audience,
+        length=length,
+        mode=mode,
+        keywords=keywords,
+        outline=outline,
+        sources=sources,
+        source_names=source_names,
+        lang=lang,
+        llm_client=llm_client,
+        call_timeout=call_timeout,
+        fallbacks=fallbacks,
+    )
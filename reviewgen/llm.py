@@ -8,20 +8,186 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import logging
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional fast JSON encoder.
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def _dumps(payload: Dict) -> bytes:
+    """Serialize a request payload to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(resp: requests.Response) -> Any:
+    """Parse a JSON response body straight from its raw bytes."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def _new_session(headers: Dict[str, str]) -> requests.Session:
+    """Keep-alive HTTP session with a connection pool sized for concurrent section calls.
+
+    Retries are not done here but in ``LLMClient.generate_limited``, which
+    checks the caller's deadline between attempts.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_BACKOFF = 0.5
+_RETRY_BACKOFF_MAX = 8.0
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Connection errors, timeouts, 429 and 5xx responses are worth another attempt."""
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def _cap_tokens(max_tokens: int, limit: Optional[int]) -> int:
+    """Apply the client-wide output token ceiling, if any."""
+    return min(max_tokens, limit) if limit else max_tokens
+
+
+class _CallLimiter:
+    """Process-wide cap on in-flight LLM calls plus an optional requests-per-minute ceiling.
+
+    Thread-based so it holds across the separate event loops of concurrent web requests.
+    """
+
+    def __init__(self, max_concurrent: int, max_per_minute: int = 0):
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._max_per_minute = max_per_minute
+        self._sent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, deadline: Optional[float] = None) -> Iterator[None]:
+        """Hold one call slot; raise TimeoutError if the call cannot start before ``deadline``.
+
+        ``deadline`` is a ``time.monotonic()`` value; None waits indefinitely.
+        """
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("no free LLM call slot before the deadline")
+        try:
+            self._wait_for_quota(deadline)
+            yield
+        finally:
+            self._slots.release()
+
+    def _wait_for_quota(self, deadline: Optional[float] = None) -> None:
+        if self._max_per_minute <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                if len(self._sent) < self._max_per_minute:
+                    self._sent.append(now)
+                    return
+                delay = 60 - (now - self._sent[0])
+            if deadline is not None and now + delay > deadline:
+                raise TimeoutError("LLM requests-per-minute quota exhausted until after the deadline")
+            time.sleep(delay)
+
+
+_LIMITER = _CallLimiter(
+    int(os.getenv("REVIEWGEN_MAX_CONCURRENT", "8")),
+    int(os.getenv("REVIEWGEN_MAX_QPM", "0")),
+)
 
 
 class LLMClient(ABC):
     """Abstract LLM client."""
 
+    # Extra attempts ``generate_limited`` makes after a retryable failure.
+    max_retries: int = 0
+
     @abstractmethod
     def generate(self, prompt: str, max_tokens: int = 256) -> str:
         """Generate text given a prompt."""
 
+    def cache_id(self) -> Optional[str]:
+        """Identify provider/model/endpoint for response caching; None disables caching."""
+        return None
+
+    def close(self) -> None:
+        """Release pooled HTTP connections, if the client holds any."""
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 256,
+        *,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> str:
+        """Awaitable ``generate``; the blocking HTTP call runs in a worker thread.
+
+        Calls are throttled by REVIEWGEN_MAX_CONCURRENT (default 8) and, when set,
+        REVIEWGEN_MAX_QPM. With ``timeout`` the await raises TimeoutError after that
+        many seconds, and a call still waiting for the limiter by then is never sent.
+        A request already in flight keeps its thread until the HTTP timeout, so pass an
+        ``executor`` that can be shut down without waiting (``asyncio.run`` joins the
+        default one).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        call = functools.partial(self.generate_limited, prompt, max_tokens, deadline=deadline)
+        return await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(executor, call), timeout)
+
+    def generate_limited(self, prompt: str, max_tokens: int = 256, *, deadline: Optional[float] = None) -> str:
+        """Blocking ``generate`` under the process-wide call limiter.
+
+        Retryable failures are retried up to ``max_retries`` times with capped
+        exponential backoff; the limiter slot is released while waiting. Raises
+        TimeoutError if the call cannot start before ``deadline`` (a
+        ``time.monotonic()`` value), and no retry starts after it.
+        """
+        attempt = 0
+        while True:
+            with _LIMITER.slot(deadline):
+                try:
+                    return self.generate(prompt, max_tokens=max_tokens)
+                except Exception as exc:
+                    if attempt >= self.max_retries or not _is_retryable(exc):
+                        raise
+                    error = exc
+            delay = min(_RETRY_BACKOFF * 2**attempt, _RETRY_BACKOFF_MAX)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
 
 class LocalRuleLLM(LLMClient):
     """Default offline generator using simple templates."""
@@ -35,19 +201,35 @@ class LocalRuleLLM(LLMClient):
 class HFInferenceLLM(LLMClient):
     """Hugging Face Inference API client (can point to free public models)."""
 
-    def __init__(self, endpoint: str, token: Optional[str] = None, timeout: int = 8):
+    def __init__(
+        self,
+        endpoint: str,
+        token: Optional[str] = None,
+        timeout: int = 8,
+        max_output_tokens: Optional[int] = None,
+        max_retries: int = 3,
+    ):
         self.endpoint = endpoint
         self.token = token
         self.timeout = timeout
+        self.max_output_tokens = max_output_tokens
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self.max_retries = max_retries
+        self._session = _new_session(headers)
+
+    def cache_id(self) -> Optional[str]:
+        return f"huggingface::{self.endpoint}"
+
+    def close(self) -> None:
+        self._session.close()
 
     def generate(self, prompt: str, max_tokens: int = 256) -> str:
-        headers = {"Content-Type": "application/json"}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens}}
-        resp = requests.post(self.endpoint, headers=headers, data=json.dumps(payload), timeout=self.timeout)
+        payload = {"inputs": prompt, "parameters": {"max_new_tokens": _cap_tokens(max_tokens, self.max_output_tokens)}}
+        resp = self._session.post(self.endpoint, data=_dumps(payload), timeout=self.timeout)
         resp.raise_for_status()
-        data = resp.json()
+        data = _loads(resp)
         # HF text-generation returns list of dicts with 'generated_text'
         if isinstance(data, list) and data and "generated_text" in data[0]:
             return data[0]["generated_text"]
@@ -63,26 +245,33 @@ class OpenAIClient(LLMClient):
         api_base: str = "https://api.openai.com/v1",
         model: str = "gpt-3.5-turbo",
         timeout: int = 8,
+        max_output_tokens: Optional[int] = None,
+        max_retries: int = 3,
     ):
         self.api_key = api_key
         self.api_base = api_base
         self.model = model
         self.timeout = timeout
+        self.max_output_tokens = max_output_tokens
+        self.max_retries = max_retries
+        self._session = _new_session({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+
+    def cache_id(self) -> Optional[str]:
+        return f"openai:{self.model}:{self.api_base}"
+
+    def close(self) -> None:
+        self._session.close()
 
     def generate(self, prompt: str, max_tokens: int = 256) -> str:
         # Deliberately lightweight placeholder without full dependency.
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": max_tokens,
+            "max_tokens": _cap_tokens(max_tokens, self.max_output_tokens),
         }
-        resp = requests.post(f"{self.api_base}/chat/completions", headers=headers, json=payload, timeout=self.timeout)
+        resp = self._session.post(f"{self.api_base}/chat/completions", data=_dumps(payload), timeout=self.timeout)
         resp.raise_for_status()
-        data: Dict = resp.json()
+        data: Dict = _loads(resp)
         choice = data.get("choices", [{}])[0]
         return choice.get("message", {}).get("content", "")
 
@@ -96,35 +285,40 @@ class DeepSeekClient(LLMClient):
         api_base: str = "https://api.deepseek.com",
         model: str = "deepseek-chat",
         timeout: int = 8,
+        max_output_tokens: Optional[int] = None,
+        max_retries: int = 3,
     ):
         self.api_key = api_key
         self.api_base = api_base.rstrip("/")
         self.model = model
         self.timeout = timeout
+        self.max_output_tokens = max_output_tokens
+        self.max_retries = max_retries
+        self._session = _new_session({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+
+    def cache_id(self) -> Optional[str]:
+        return f"deepseek:{self.model}:{self.api_base}"
+
+    def close(self) -> None:
+        self._session.close()
 
     def generate(self, prompt: str, max_tokens: int = 256) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": max_tokens,
+            "max_tokens": _cap_tokens(max_tokens, self.max_output_tokens),
             "temperature": 0.7,
         }
         try:
-            resp = requests.post(
-                f"{self.api_base}/chat/completions", headers=headers, json=payload, timeout=self.timeout
-            )
+            resp = self._session.post(f"{self.api_base}/chat/completions", data=_dumps(payload), timeout=self.timeout)
         except Exception as exc:  # pragma: no cover - debug aid
-            print(f"[DeepSeekClient] request error: {exc}")
+            logger.debug("[DeepSeekClient] request error: %s", exc)
             raise
-        print(f"[DeepSeekClient] status={resp.status_code}")  # pragma: no cover - debug aid
-        if resp.text:
-            print(f"[DeepSeekClient] body={resp.text[:400]}")  # pragma: no cover - debug aid
+        if logger.isEnabledFor(logging.DEBUG):  # pragma: no cover - debug aid
+            logger.debug("[DeepSeekClient] status=%s", resp.status_code)
+            logger.debug("[DeepSeekClient] body=%s", resp.text[:400])
         resp.raise_for_status()
-        data: Dict = resp.json()
+        data: Dict = _loads(resp)
         choice = data.get("choices", [{}])[0]
         return choice.get("message", {}).get("content", "")
 
@@ -136,19 +330,55 @@ def build_llm_client(
     model: Optional[str] = None,
     token: Optional[str] = None,
     timeout: int = 8,
+    max_output_tokens: Optional[int] = None,
+    max_retries: int = 3,
+    cache: bool = False,
 ) -> LLMClient:
-    """Factory to build an LLM client."""
+    """Factory to build an LLM client.
+
+    With ``cache=True`` remote clients are wrapped so repeated prompts are served
+    from the response cache (see ``reviewgen.llm_cache``).
+    """
+    client = _build_remote_client(
+        provider,
+        endpoint=endpoint,
+        model=model,
+        token=token,
+        timeout=timeout,
+        max_output_tokens=max_output_tokens,
+        max_retries=max_retries,
+    )
+    if client is None:
+        return LocalRuleLLM()
+    if cache:
+        from .llm_cache import CachedLLM
+
+        return CachedLLM(client)
+    return client
+
+
+def _build_remote_client(
+    provider: str,
+    *,
+    endpoint: Optional[str],
+    model: Optional[str],
+    token: Optional[str],
+    timeout: int,
+    max_output_tokens: Optional[int],
+    max_retries: int,
+) -> Optional[LLMClient]:
+    limits = {"timeout": timeout, "max_output_tokens": max_output_tokens, "max_retries": max_retries}
     if provider == "huggingface":
         if not endpoint:
             raise ValueError("HF Inference endpoint is required for huggingface provider")
-        return HFInferenceLLM(endpoint=endpoint, token=token, timeout=timeout)
+        return HFInferenceLLM(endpoint=endpoint, token=token, **limits)
     if provider == "openai":
         if not token:
             raise ValueError("OpenAI api_key is required for openai provider")
-        return OpenAIClient(api_key=token, model=model or "gpt-3.5-turbo", timeout=timeout)
+        return OpenAIClient(api_key=token, model=model or "gpt-3.5-turbo", **limits)
     if provider == "deepseek":
         if not token:
             raise ValueError("DeepSeek api_key is required for deepseek provider")
         base = endpoint or "https://api.deepseek.com"
-        return DeepSeekClient(api_key=token, api_base=base, model=model or "deepseek-chat", timeout=timeout)
-    return LocalRuleLLM()
+        return DeepSeekClient(api_key=token, api_base=base, model=model or "deepseek-chat", **limits)
+    return None
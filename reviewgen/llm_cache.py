@@ -0,0 +1,88 @@
+"""Response cache for remote LLM clients.
+
+Identical prompts sent to the same provider/model are answered from an in-memory
+LRU first, then from an on-disk ``shelve`` store shared across runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import shelve
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .llm import LLMClient
+from .utils import LRUCache
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "reviewgen"
+
+
+def cache_key(client_id: str, prompt: str, max_tokens: int) -> str:
+    """Stable key for a (client, prompt, max_tokens) request."""
+    raw = f"{client_id}\0{max_tokens}\0{prompt}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Two-level LLM response cache: bounded memory LRU backed by a shelve file."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, maxsize: int = 1024):
+        self.path = Path(cache_dir or DEFAULT_CACHE_DIR) / "llm_responses"
+        self.maxsize = maxsize
+        self._memory: LRUCache[str] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                return value
+            try:
+                with shelve.open(str(self.path), flag="r") as db:
+                    value = db.get(key)
+            except Exception:
+                # Missing or unreadable store behaves like a miss.
+                return None
+            if value is not None:
+                self._memory.set(key, value)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._memory.set(key, value)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with shelve.open(str(self.path)) as db:
+                    db[key] = value
+            except Exception:
+                # The disk layer is best-effort; memory still holds the value.
+                pass
+
+
+class CachedLLM(LLMClient):
+    """Wrap an LLM client so repeated prompts skip the network round-trip."""
+
+    def __init__(self, client: LLMClient, cache: Optional[ResponseCache] = None):
+        self.client = client
+        self.cache = cache or ResponseCache()
+        self.max_retries = client.max_retries
+
+    def cache_id(self) -> Optional[str]:
+        return self.client.cache_id()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def generate(self, prompt: str, max_tokens: int = 256) -> str:
+        client_id = self.client.cache_id()
+        if client_id is None:
+            return self.client.generate(prompt, max_tokens=max_tokens)
+        key = cache_key(client_id, prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        text = self.client.generate(prompt, max_tokens=max_tokens)
+        if text:
+            self.cache.set(key, text)
+        return text
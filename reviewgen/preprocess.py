@@ -2,83 +2,193 @@
 
 from __future__ import annotations
 
+import glob as _glob
+import hashlib
+import heapq
+import math
+import operator
 import re
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
-
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# BOM is folded into the whitespace class so cleaning is a single regex pass.
+_WS_RE = re.compile(r"[\s\ufeff]+")
+# Whitespace (or BOM) inside a line, and the non-empty lines of a blob.
+_INLINE_WS_RE = re.compile(r"(?:[^\S\r\n]|\ufeff)+")
+_LINE_RE = re.compile(r"[^\r\n]+")
+_SENT_SPLIT_RE = re.compile(r"(?<=[。.!?])\s+")
+_TOKEN_RE = re.compile(r"\b\w\w+\b")
+
+# Same list as scikit-learn's ENGLISH_STOP_WORDS.
+_STOP_WORDS = frozenset(
+    """
+    a about above across after afterwards again against all almost alone along already also although
+    always am among amongst amoungst amount an and another any anyhow anyone anything anyway anywhere
+    are around as at back be became because become becomes becoming been before beforehand behind being
+    below beside besides between beyond bill both bottom but by call can cannot cant co con could
+    couldnt cry de describe detail do done down due during each eg eight either eleven else elsewhere
+    empty enough etc even ever every everyone everything everywhere except few fifteen fifty fill find
+    fire first five for former formerly forty found four from front full further get give go had has
+    hasnt have he hence her here hereafter hereby herein hereupon hers herself him himself his how
+    however hundred i ie if in inc indeed interest into is it its itself keep last latter latterly least
+    less ltd made many may me meanwhile might mill mine more moreover most mostly move much must my
+    myself name namely neither never nevertheless next nine no nobody none noone nor not nothing now
+    nowhere of off often on once one only onto or other others otherwise our ours ourselves out over own
+    part per perhaps please put rather re same see seem seemed seeming seems serious several she should
+    show side since sincere six sixty so some somehow someone something sometime sometimes somewhere
+    still such system take ten than that the their them themselves then thence there thereafter thereby
+    therefore therein thereupon these they thick thin third this those though three through throughout
+    thru thus to together too top toward towards twelve twenty two un under until up upon us very via
+    was we well were what whatever when whence whenever where whereafter whereas whereby wherein
+    whereupon wherever whether which while whither who whoever whole whom whose why will with within
+    without would yet you your yours yourself yourselves
+    """.split()
+)
+
+
+# Path.glob, used before, also matched dotfiles; glob only does with include_hidden (3.11+).
+_GLOB_OPTIONS = {"include_hidden": True} if sys.version_info >= (3, 11) else {}
+
+
+def _read_source(path: Path) -> Optional[str]:
+    """Read a source file, returning None when it cannot be read."""
+    try:
+        # Bytes + one decode avoids the text-mode incremental decoder.
+        return path.read_bytes().decode("utf-8", "ignore")
+    except OSError:
+        return None
 
 
 def load_texts(paths: Sequence[Path]) -> List[Tuple[Path, str]]:
     """Load raw texts from given paths.
 
     Supports glob patterns; silently skips missing files.
-    Returns (path, text) tuples.
+    Files are read concurrently; returns (path, text) tuples in match order.
     """
-    items: List[Tuple[Path, str]] = []
+    resolved_list: List[Path] = []
     for path in paths:
-        for resolved in Path().glob(str(path)):
+        path = Path(path)
+        if path.is_file():
+            # Plain file path: no pattern to expand.
+            resolved_list.append(path)
+            continue
+        for match in _glob.iglob(str(path), recursive=True, **_GLOB_OPTIONS):
+            resolved = Path(match)
             if resolved.is_file():
-                try:
-                    items.append((resolved, resolved.read_text(encoding="utf-8")))
-                except OSError:
-                    continue
-    return items
+                resolved_list.append(resolved)
+    if not resolved_list:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(32, len(resolved_list))) as ex:
+        texts = list(ex.map(_read_source, resolved_list))
+    return [(p, t) for p, t in zip(resolved_list, texts) if t is not None]
 
 
 def basic_clean(text: str) -> str:
     """Basic cleaning: strip, normalize whitespace."""
-    text = text.replace("\ufeff", " ").strip()
-    text = re.sub(r"\s+", " ", text)
-    return text
+    return _WS_RE.sub(" ", text).strip()
+
+
+def fingerprint(text: str) -> bytes:
+    """Fixed-size content hash used as a dedup key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def basic_clean_bulk(text: str) -> List[str]:
+    """Clean every line of a text blob; returns the non-empty cleaned lines.
+
+    Lines end at ``\r`` or ``\n``. Same result as ``basic_clean`` on each line, but
+    whitespace is collapsed in one regex pass and lines are found in another.
+    """
+    return [line for line in map(str.strip, _LINE_RE.findall(_INLINE_WS_RE.sub(" ", text))) if line]
 
 
 def deduplicate(texts: Iterable[str]) -> List[str]:
     """Deduplicate while preserving order."""
-    seen = set()
+    seen: set[bytes] = set()
     unique: List[str] = []
     for t in texts:
         key = t.strip()
-        if key and key not in seen:
-            seen.add(key)
+        if not key:
+            continue
+        h = fingerprint(key)
+        if h not in seen:
+            seen.add(h)
             unique.append(key)
     return unique
 
 
 def segment_text(text: str, max_len: int = 400) -> List[str]:
-    """Split text into chunks for downstream processing."""
-    sentences = re.split(r"(?<=[。.!?])\s+", text)
+    """Split text into chunks for downstream processing.
+
+    Chunks are sliced straight out of ``text`` at sentence boundaries, so the
+    original separator between sentences of the same chunk is kept.
+    """
     chunks: List[str] = []
-    current: List[str] = []
+    chunk_start = chunk_end = 0
     current_len = 0
-    for sent in sentences:
-        if not sent:
-            continue
-        if current_len + len(sent) > max_len and current:
-            chunks.append(" ".join(current))
-            current = [sent]
-            current_len = len(sent)
-        else:
-            current.append(sent)
-            current_len += len(sent)
-    if current:
-        chunks.append(" ".join(current))
+    pos = 0
+    boundaries = ((m.start(), m.end()) for m in _SENT_SPLIT_RE.finditer(text))
+    for end, next_pos in chain(boundaries, ((len(text), len(text)),)):
+        sent_len = end - pos
+        if sent_len:
+            if current_len and current_len + sent_len > max_len:
+                chunks.append(text[chunk_start:chunk_end])
+                current_len = 0
+            if not current_len:
+                chunk_start = pos
+            current_len += sent_len
+            chunk_end = end
+        pos = next_pos
+    if current_len:
+        chunks.append(text[chunk_start:chunk_end])
     return chunks
 
 
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with English stop words removed."""
+    return [tok for tok in _TOKEN_RE.findall(text.lower()) if tok not in _STOP_WORDS]
+
+
+def _ngrams(tokens: List[str]) -> List[str]:
+    """Unigrams followed by bigrams."""
+    return tokens + list(map(" ".join, zip(tokens, tokens[1:])))
+
+
 def extract_keywords(texts: List[str], top_k: int = 8) -> List[str]:
-    """Extract keywords using a simple TF-IDF approach."""
+    """Extract keywords using a simple TF-IDF approach.
+
+    Each document's tf-idf vector (smoothed idf, L2-normalized) is summed over the
+    corpus and the highest-scoring unigrams/bigrams are returned.
+    """
     if not texts:
         return []
-    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2), max_features=512)
-    try:
-        matrix = vectorizer.fit_transform(texts)
-    except ValueError:
+    doc_counts = [Counter(_ngrams(_tokenize(t))) for t in texts]
+    df: Counter = Counter()
+    for counts in doc_counts:
+        df.update(counts.keys())
+    if not df:
         return []
-    scores = matrix.sum(axis=0).A1
-    vocab = vectorizer.get_feature_names_out()
-    ranked = sorted(zip(vocab, scores), key=lambda x: x[1], reverse=True)
-    return [w for w, _ in ranked[:top_k]]
+
+    n_docs = len(doc_counts)
+    idf = {term: math.log((1 + n_docs) / (1 + freq)) + 1.0 for term, freq in df.items()}
+    scores: Dict[str, float] = {}
+    get_score = scores.get
+    for counts in doc_counts:
+        # map/hypot keep the per-term arithmetic in C; only the accumulation loops in Python.
+        weights = list(map(operator.mul, counts.values(), map(idf.__getitem__, counts)))
+        norm = math.hypot(*weights)
+        if not norm:
+            continue
+        inv_norm = 1.0 / norm
+        for term, w in zip(counts, weights):
+            scores[term] = get_score(term, 0.0) + w * inv_norm
+    # Ties go to the alphabetically first term, as with sklearn's sorted vocabulary.
+    return heapq.nsmallest(top_k, scores, key=lambda term: (-scores[term], term))
 
 
 def preprocess_sources(paths: Sequence[Path]) -> Tuple[List[str], List[str], List[str]]:
@@ -89,18 +199,19 @@ def preprocess_sources(paths: Sequence[Path]) -> Tuple[List[str], List[str], Lis
         unique_texts: deduplicated cleaned documents.
         source_names: filenames corresponding to unique_texts order.
     """
-    raw_items = load_texts(paths)
-    cleaned_items: List[Tuple[Path, str]] = [(p, basic_clean(t)) for p, t in raw_items]
-    seen = set()
+    seen: set[bytes] = set()
+    segments: List[str] = []
     unique_texts: List[str] = []
     source_names: List[str] = []
-    for path, text in cleaned_items:
-        if text and text not in seen:
-            seen.add(text)
-            unique_texts.append(text)
-            source_names.append(path.name)
-
-    segments: List[str] = []
-    for t in unique_texts:
-        segments.extend(segment_text(t))
+    for path, raw in load_texts(paths):
+        text = basic_clean(raw)
+        if not text:
+            continue
+        h = fingerprint(text)
+        if h in seen:
+            continue
+        seen.add(h)
+        unique_texts.append(text)
+        source_names.append(path.name)
+        segments.extend(segment_text(text))
     return segments, unique_texts, source_names
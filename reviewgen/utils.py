@@ -3,7 +3,13 @@
 from __future__ import annotations
 
 import textwrap
-from typing import Iterable, List
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+_V = TypeVar("_V")
 
 
 def truncate_text(text: str, length: int) -> str:
@@ -27,6 +33,80 @@ def chunk_list(items: Iterable[str], size: int) -> List[str]:
     return chunks
 
 
+@lru_cache(maxsize=8)
+def _wrapper(width: int) -> textwrap.TextWrapper:
+    """Reusable TextWrapper per width (textwrap.fill builds a new one per call)."""
+    return textwrap.TextWrapper(width=width)
+
+
 def wrap_paragraph(text: str, width: int = 90) -> str:
     """Wrap text for readability."""
-    return textwrap.fill(text, width=width)
+    return _wrapper(width).fill(text)
+
+
+class LRUCache(Generic[_V]):
+    """Small thread-safe LRU with optional expiry.
+
+    ``on_evict`` is called, outside the lock, for every value dropped by size or age.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: Optional[float] = None, on_evict: Optional[Callable[[_V], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._items: "OrderedDict[Hashable, Tuple[float, _V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[_V]:
+        evicted: List[_V] = []
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._items[key]
+                evicted.append(value)
+                value = None
+            else:
+                self._items.move_to_end(key)
+        self._evict(evicted)
+        return value
+
+    def set(self, key: Hashable, value: _V) -> None:
+        with self._lock:
+            old = self._items.get(key)
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            evicted = self._trim()
+        if old is not None and old[1] is not value:
+            evicted.append(old[1])
+        self._evict(evicted)
+
+    def setdefault(self, key: Hashable, value: _V) -> _V:
+        """Store ``value`` unless ``key`` is already present; return the stored value."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                return item[1]
+            self._items[key] = (time.monotonic(), value)
+            evicted = self._trim()
+        self._evict(evicted)
+        return value
+
+    def _trim(self) -> List[_V]:
+        evicted = []
+        while len(self._items) > self.maxsize:
+            evicted.append(self._items.popitem(last=False)[1][1])
+        return evicted
+
+    def _evict(self, values: List[_V]) -> None:
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
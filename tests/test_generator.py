@@ -1,4 +1,60 @@
-from reviewgen import generator
+import asyncio
+import threading
+import time
+
+import pytest
+
+from reviewgen import generator, llm
+
+
+class StubLLM(llm.LLMClient):
+    """Remote-style client answering "paragraph for <section>" after ``delay`` seconds.
+
+    ``fail`` makes every call raise; ``peak`` records the most calls in flight at once.
+    """
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, max_tokens: int = 256) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("LLM unavailable")
+            section = prompt.split("Section: ", 1)[1].split("\n", 1)[0]
+            return f"paragraph for {section}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _review_kwargs(**overrides):
+    kwargs = dict(
+        topic="Topic",
+        audience="general",
+        length=200,
+        mode="timeline",
+        keywords=["a"],
+        outline=["Alpha", "Beta", "Gamma"],
+        sources=[],
+        source_names=[],
+        lang="en",
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+@pytest.fixture
+def serial_limiter(monkeypatch):
+    """Allow only one LLM call in flight."""
+    monkeypatch.setattr(llm, "_LIMITER", llm._CallLimiter(max_concurrent=1))
 
 
 def test_generate_review_mentions_no_external_sources_when_empty():
@@ -31,3 +87,61 @@ def test_generate_review_includes_citation_markers_when_sources():
         lang="en",
     )
     assert "[S1]" in text
+
+
+def test_generate_review_keeps_section_order_with_remote_client():
+    text = generator.generate_review(**_review_kwargs(llm_client=StubLLM()))
+    positions = [text.index(f"paragraph for {title}") for title in ["Alpha", "Beta", "Gamma"]]
+    assert positions == sorted(positions)
+
+
+def test_agenerate_review_matches_sync_output():
+    kwargs = _review_kwargs(outline=["Alpha", "Beta"], sources=["x"], source_names=["x.txt"], llm_client=StubLLM())
+    assert asyncio.run(generator.agenerate_review(**kwargs)) == generator.generate_review(**kwargs)
+
+
+def test_stream_review_concatenates_to_generate_review():
+    for client in (None, StubLLM()):
+        kwargs = _review_kwargs(sources=["x"], source_names=["x.txt"], llm_client=client)
+        chunks = list(generator.stream_review(**kwargs))
+        assert len(chunks) > 1
+        assert "".join(chunks) == generator.generate_review(**kwargs)
+
+
+def test_agenerate_review_does_not_wait_for_timed_out_calls():
+    start = time.monotonic()
+    kwargs = _review_kwargs(outline=["Alpha", "Beta"], llm_client=StubLLM(delay=1.0), call_timeout=0.1)
+    text = asyncio.run(generator.agenerate_review(**kwargs))
+    assert time.monotonic() - start < 0.8
+    assert "paragraph for" not in text
+    assert "This section covers 'Alpha'" in text
+
+
+def test_stream_review_respects_call_limiter_and_timeout(serial_limiter):
+    client = StubLLM(delay=0.2)
+    kwargs = _review_kwargs(outline=["Alpha", "Beta", "Gamma", "Delta"], llm_client=client)
+    assert "".join(generator.stream_review(**kwargs)).count("paragraph for") == 4
+    assert client.peak == 1
+
+    fallbacks = []
+    start = time.monotonic()
+    text = "".join(generator.stream_review(**kwargs, call_timeout=0.3, fallbacks=fallbacks))
+    assert time.monotonic() - start < 0.6
+    assert fallbacks == ["Beta", "Gamma", "Delta"]
+    assert text.count("paragraph for") == 1
+
+
+def test_generate_review_respects_call_limiter(serial_limiter):
+    client = StubLLM(delay=0.02)
+    text = generator.generate_review(**_review_kwargs(llm_client=client))
+    assert text.count("paragraph for") == 3
+    assert client.peak == 1
+
+
+def test_aplan_and_generate_plans_outline_and_reports_fallbacks():
+    fallbacks = []
+    kwargs = _review_kwargs(mode="custom", llm_client=StubLLM(fail=True), call_timeout=1.0, fallbacks=fallbacks)
+    del kwargs["outline"]
+    text = asyncio.run(generator.aplan_and_generate(custom_outline="Alpha;Beta", **kwargs))
+    assert "## Alpha" in text and "## Beta" in text
+    assert fallbacks == ["Alpha", "Beta"]
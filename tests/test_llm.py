@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from reviewgen import llm
+from reviewgen.llm import _CallLimiter, _loads
+
+
+def test_call_limiter_caps_concurrent_calls():
+    limiter = _CallLimiter(max_concurrent=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal active, peak
+        with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+
+
+def test_call_limiter_gives_up_at_deadline():
+    limiter = _CallLimiter(max_concurrent=1)
+    with limiter.slot():
+        with pytest.raises(TimeoutError):
+            with limiter.slot(deadline=time.monotonic() + 0.02):
+                pass
+
+
+def test_loads_parses_response_bytes():
+    resp = requests.Response()
+    resp._content = '{"choices": [{"message": {"content": "综述"}}]}'.encode("utf-8")
+    assert _loads(resp)["choices"][0]["message"]["content"] == "综述"
+
+
+class _FlakyLLM(llm.LLMClient):
+    def __init__(self, status: int, max_retries: int):
+        self.status = status
+        self.max_retries = max_retries
+        self.calls = 0
+
+    def generate(self, prompt: str, max_tokens: int = 256) -> str:
+        self.calls += 1
+        resp = requests.Response()
+        resp.status_code = self.status
+        raise requests.HTTPError(response=resp)
+
+
+def test_generate_limited_retries_retryable_errors(monkeypatch):
+    monkeypatch.setattr(llm, "_RETRY_BACKOFF", 0.0)
+    unavailable = _FlakyLLM(503, max_retries=2)
+    with pytest.raises(requests.HTTPError):
+        unavailable.generate_limited("p")
+    assert unavailable.calls == 3
+
+    unauthorized = _FlakyLLM(401, max_retries=2)
+    with pytest.raises(requests.HTTPError):
+        unauthorized.generate_limited("p")
+    assert unauthorized.calls == 1
+
+
+def test_generate_limited_stops_retrying_at_deadline(monkeypatch):
+    monkeypatch.setattr(llm, "_LIMITER", _CallLimiter(max_concurrent=1))
+    client = _FlakyLLM(503, max_retries=5)
+    start = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        client.generate_limited("p", deadline=start + 0.2)
+    assert time.monotonic() - start < 0.2
+    assert client.calls == 1
+    # The slot is free again once the call gives up.
+    with llm._LIMITER.slot(deadline=time.monotonic()):
+        pass
@@ -0,0 +1,29 @@
+from reviewgen.llm import LLMClient
+from reviewgen.llm_cache import CachedLLM, ResponseCache
+
+
+class CountingLLM(LLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    def cache_id(self):
+        return "fake:model"
+
+    def generate(self, prompt: str, max_tokens: int = 256) -> str:
+        self.calls += 1
+        return f"answer to {prompt}"
+
+
+def test_cached_llm_reuses_memory_and_disk(tmp_path):
+    inner = CountingLLM()
+    client = CachedLLM(inner, ResponseCache(tmp_path))
+    assert client.generate("p", max_tokens=10) == "answer to p"
+    assert client.generate("p", max_tokens=10) == "answer to p"
+    assert inner.calls == 1
+
+    fresh = CountingLLM()
+    reloaded = CachedLLM(fresh, ResponseCache(tmp_path))
+    assert reloaded.generate("p", max_tokens=10) == "answer to p"
+    assert fresh.calls == 0
+    reloaded.generate("p", max_tokens=20)
+    assert fresh.calls == 1
@@ -1,5 +1,8 @@
+import sys
 from pathlib import Path
 
+import pytest
+
 import reviewgen.preprocess as pp
 
 
@@ -23,3 +26,41 @@ def test_extract_keywords_returns_top_terms():
     texts = ["machine learning improves models", "deep learning improves representations"]
     keywords = pp.extract_keywords(texts, top_k=3)
     assert keywords  # non-empty
+
+
+def test_load_texts_expands_glob_and_plain_paths(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("alpha", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("beta", encoding="utf-8")
+    items = pp.load_texts([tmp_path / "a.txt", tmp_path / "**" / "b.txt", tmp_path / "missing*.txt"])
+    assert [text for _, text in items] == ["alpha", "beta"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="glob.include_hidden needs Python 3.11")
+def test_load_texts_glob_includes_dotfiles(tmp_path: Path):
+    (tmp_path / ".notes.txt").write_text("hidden", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("alpha", encoding="utf-8")
+    assert sorted(text for _, text in pp.load_texts([tmp_path / "*"])) == ["alpha", "hidden"]
+
+
+def test_extract_keywords_ranks_shared_terms_and_skips_stop_words():
+    texts = ["the graph models are good", "graph learning for the graph"]
+    keywords = pp.extract_keywords(texts, top_k=2)
+    assert keywords[0] == "graph"
+    assert "the" not in pp.extract_keywords(texts, top_k=20)
+
+
+def test_preprocess_sources_dedups_and_keeps_names(tmp_path: Path):
+    (tmp_path / "a.txt").write_text("Same  text. Here!", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("Same text.\nHere!", encoding="utf-8")
+    (tmp_path / "c.txt").write_text("Other text.", encoding="utf-8")
+    segments, unique_texts, names = pp.preprocess_sources([tmp_path / "*.txt"])
+    assert sorted(names) == ["a.txt", "c.txt"] or sorted(names) == ["b.txt", "c.txt"]
+    assert len(unique_texts) == 2
+    assert segments
+
+
+def test_basic_clean_bulk_matches_per_line_cleaning():
+    blob = "﻿ first   line \n\n\t second\tline\r\n   \nthird"
+    expected = [c for c in (pp.basic_clean(line) for line in blob.splitlines()) if c]
+    assert pp.basic_clean_bulk(blob) == expected == ["first line", "second line", "third"]
@@ -0,0 +1,196 @@
+import gzip
+import io
+import json
+import tempfile
+
+from werkzeug.datastructures import FileStorage
+
+import webapp
+from reviewgen.llm import LLMClient
+from reviewgen.utils import LRUCache
+
+
+def _client():
+    webapp.app.config["TESTING"] = True
+    return webapp.app.test_client()
+
+
+def test_index_get_renders_form():
+    resp = _client().get("/")
+    assert resp.status_code == 200
+    assert b"Review Generator" in resp.data
+
+
+def test_index_post_uses_pasted_and_uploaded_sources():
+    data = {
+        "topic": "Graphs",
+        "lang": "en",
+        "sources_text": "First source.\nFirst source.",
+        "sources_files": (io.BytesIO("Uploaded\n  text\r\nbody.".encode("utf-8")), "notes.txt"),
+    }
+    resp = _client().post("/", data=data, content_type="multipart/form-data")
+    html = resp.get_data(as_text=True)
+    assert resp.status_code == 200
+    assert "[S1] pasted_1.txt" in html
+    assert "[S2] notes.txt" in html
+    assert "[S3]" not in html
+
+
+def test_index_post_escapes_user_input():
+    resp = _client().post("/", data={"topic": "<script>x</script>", "lang": "en"})
+    html = resp.get_data(as_text=True)
+    assert "<script>x</script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_index_post_reuses_cached_result(monkeypatch):
+    client = _client()
+    data = {"topic": "Cached topic", "lang": "en", "mode": "custom", "outline": "A;B"}
+    first = client.post("/", data=data).get_data(as_text=True)
+
+    async def fail(**kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(webapp, "agenerate_review", fail)
+    assert client.post("/", data=data).get_data(as_text=True) == first
+
+
+def test_stream_sends_review_as_events():
+    data = {"topic": "Streamed", "lang": "en", "mode": "custom", "outline": "A;B"}
+    resp = _client().post("/stream", data=data)
+    assert resp.mimetype == "text/event-stream"
+    events = [block for block in resp.get_data(as_text=True).split("\n\n") if block]
+    chunks = [json.loads(block.split("data: ", 1)[1]) for block in events if block.startswith("event: message")]
+    assert "".join(chunks).startswith("# Streamed — Review")
+    assert events[-1].startswith("event: done")
+
+
+def test_index_post_local_provider_in_process_pool(monkeypatch):
+    data = {"topic": "Pooled", "lang": "en", "mode": "custom", "outline": "A;B", "sources_text": "Pooled source."}
+    inline = _client().post("/", data=data).get_data(as_text=True)
+    monkeypatch.setattr(webapp, "_RESULTS", LRUCache(maxsize=256, ttl=3600.0))
+    monkeypatch.setattr(webapp, "_LOCAL_WORKERS", 1)
+    monkeypatch.setattr(webapp, "_LOCAL_POOL", None)
+    try:
+        pooled = _client().post("/", data=data).get_data(as_text=True)
+    finally:
+        webapp._LOCAL_POOL.shutdown()
+    assert pooled == inline
+
+
+def test_index_post_skips_oversized_upload(monkeypatch):
+    monkeypatch.setattr(webapp, "_MAX_FILE_BYTES", 16)
+    data = {
+        "topic": "Sizes",
+        "lang": "en",
+        "sources_files": [
+            (io.BytesIO(b"small"), "small.txt"),
+            (io.BytesIO(b"x" * 64), "big.txt"),
+        ],
+    }
+    html = _client().post("/", data=data, content_type="multipart/form-data").get_data(as_text=True)
+    assert "small.txt" in html
+    assert "big.txt" not in html
+
+
+def test_index_post_rejects_oversized_request(monkeypatch):
+    monkeypatch.setitem(webapp.app.config, "MAX_CONTENT_LENGTH", 1024)
+    data = {"topic": "Too big", "sources_files": (io.BytesIO(b"x" * 4096), "big.txt")}
+    resp = _client().post("/", data=data, content_type="multipart/form-data")
+    assert resp.status_code == 413
+    assert "Request too large" in resp.get_data(as_text=True)
+
+
+def test_llm_clients_are_reused_per_token():
+    options = {"endpoint": None, "model": None, "timeout": 8, "max_output_tokens": 64, "max_retries": 0}
+    first = webapp._cached_llm_client("openai", token="key-a", **options)
+    assert webapp._cached_llm_client("openai", token="key-a", **options) is first
+    assert webapp._cached_llm_client("openai", token="key-b", **options) is not first
+
+
+def test_index_get_supports_gzip_and_etag():
+    client = _client()
+    plain = client.get("/")
+    assert plain.headers["Cache-Control"] == "public, max-age=60"
+
+    zipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+
+    refused = client.get("/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in refused.headers
+
+    etag = plain.headers["ETag"]
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_clean_upload_reads_spooled_file():
+    stream = tempfile.SpooledTemporaryFile()
+    stream.write("第一行  text\r\nsecond\tline\n".encode("utf-8"))
+    stream.seek(0)
+    assert webapp._clean_upload(FileStorage(stream=stream, filename="s.txt")) == "第一行 text second line"
+
+
+def test_index_post_does_not_cache_fallback_review(monkeypatch):
+    class FailingLLM(LLMClient):
+        def generate(self, prompt: str, max_tokens: int = 256) -> str:
+            raise RuntimeError("bad token")
+
+    monkeypatch.setattr(webapp, "_cached_llm_client", lambda provider, **options: FailingLLM())
+    client = _client()
+    data = {"topic": "Flaky", "lang": "en", "mode": "custom", "outline": "A;B", "llm": "openai", "llm_token": "x"}
+    assert "This section covers &#39;A&#39;" in client.post("/", data=data).get_data(as_text=True)
+
+    async def fresh(**kwargs):
+        return "fresh review"
+
+    monkeypatch.setattr(webapp, "agenerate_review", fresh)
+    assert "fresh review" in client.post("/", data=data).get_data(as_text=True)
+
+
+def test_stream_shares_result_cache(monkeypatch):
+    client = _client()
+    data = {"topic": "Streamed cache", "lang": "en", "mode": "custom", "outline": "A;B"}
+    page = client.post("/", data=data).get_data(as_text=True)
+
+    def fail(**kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(webapp, "stream_review", fail)
+    body = client.post("/stream", data=data).get_data(as_text=True)
+    assert body.count("event: message") == 1
+    assert "Generation failed" not in body
+    assert "Streamed cache — Review" in page
+
+
+def test_evicted_llm_clients_are_closed(monkeypatch):
+    closed = []
+
+    class ClosingLLM(LLMClient):
+        def generate(self, prompt: str, max_tokens: int = 256) -> str:
+            return ""
+
+        def close(self) -> None:
+            closed.append(self)
+
+    monkeypatch.setattr(webapp, "_CLIENTS", LRUCache(maxsize=1, on_evict=webapp._CLIENTS.on_evict))
+    monkeypatch.setattr(webapp, "build_llm_client", lambda provider, **options: ClosingLLM())
+    first = webapp._cached_llm_client("openai", token="key-a")
+    webapp._cached_llm_client("openai", token="key-b")
+    assert closed == [first]
+
+
+def test_cached_llm_review_is_not_served_for_another_token(monkeypatch):
+    class GoodLLM(LLMClient):
+        def generate(self, prompt: str, max_tokens: int = 256) -> str:
+            return "llm paragraph"
+
+    monkeypatch.setattr(webapp, "_cached_llm_client", lambda provider, **options: GoodLLM())
+    client = _client()
+    data = {"topic": "Tokens", "lang": "en", "mode": "custom", "outline": "A;B", "llm": "openai", "llm_token": "good"}
+    assert "llm paragraph" in client.post("/", data=data).get_data(as_text=True)
+
+    monkeypatch.undo()
+    html = client.post("/", data={**data, "llm_token": ""}).get_data(as_text=True)
+    assert "llm paragraph" not in html
+    assert "LLM init failed" in html
@@ -2,17 +2,45 @@
 
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import functools
+import gzip
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from flask import Flask, render_template_string, request
+from flask import Flask, Response, request, stream_with_context
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, select_autoescape
+from werkzeug.datastructures import FileStorage
 
-from reviewgen.preprocess import basic_clean
-from reviewgen.generator import plan_and_generate
+from reviewgen.preprocess import basic_clean, basic_clean_bulk, fingerprint
+from reviewgen.generator import agenerate_review, generate_review, stream_review
 from reviewgen.outline import generate_outline
-from reviewgen.llm import build_llm_client
+from reviewgen.llm import LLMClient, build_llm_client
+from reviewgen.utils import LRUCache
 
 
 app = Flask(__name__)
+# Oversized request bodies are rejected with 413 before the form is parsed.
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("REVIEWGEN_MAX_UPLOAD", 16 * 1024 * 1024))
+
+# Uploaded source files above this size are skipped.
+_MAX_FILE_BYTES = 4 * 1024 * 1024
+
+# Rough token budget per target word, used to derive a per-section output cap.
+_TOKENS_PER_WORD = 1.5
+
+# Server-side ceilings for the form's per-call timeout (seconds) and retry count,
+# which bound how long one submission can hold LLM call slots.
+_MAX_LLM_TIMEOUT = 60
+_MAX_LLM_RETRIES = 5
 
 TEMPLATE = """
 <!doctype html>
@@ -44,7 +72,7 @@ TEMPLATE = """
       <div>
         <label>Audience</label>
         <select name="audience">
-          {% for a in ['researcher','student','industry','general'] %}
+          {% for a in AUDIENCES %}
             <option value="{{a}}" {% if form.audience==a %}selected{% endif %}>{{a}}</option>
           {% endfor %}
         </select>
@@ -54,7 +82,7 @@ TEMPLATE = """
       <div>
         <label>Mode</label>
         <select name="mode">
-          {% for m,label in [('timeline','Timeline'),('school','School'),('application','Application'),('custom','Custom')] %}
+          {% for m,label in MODES %}
             <option value="{{m}}" {% if form.mode==m %}selected{% endif %}>{{label}}</option>
           {% endfor %}
         </select>
@@ -66,7 +94,7 @@ TEMPLATE = """
       <div>
         <label>Language</label>
         <select name="lang">
-          {% for l in ['zh','en'] %}
+          {% for l in LANGS %}
             <option value="{{l}}" {% if form.lang==l %}selected{% endif %}>{{l}}</option>
           {% endfor %}
         </select>
@@ -88,7 +116,7 @@ TEMPLATE = """
       <div>
         <label>LLM Provider</label>
         <select name="llm">
-          {% for p in ['local','huggingface','openai','deepseek'] %}
+          {% for p in PROVIDERS %}
             <option value="{{p}}" {% if form.llm==p %}selected{% endif %}>{{p}}</option>
           {% endfor %}
         </select>
@@ -102,6 +130,16 @@ TEMPLATE = """
         <input name="llm_timeout" type="number" value="{{ form.llm_timeout }}">
       </div>
     </div>
+    <div class="row">
+      <div>
+        <label>Max output tokens per section (blank = derived from length)</label>
+        <input name="max_output_tokens" type="number" value="{{ form.max_output_tokens }}">
+      </div>
+      <div>
+        <label>LLM Max retries</label>
+        <input name="max_retries" type="number" value="{{ form.max_retries }}">
+      </div>
+    </div>
     <label>LLM Endpoint (for huggingface/deepseek override)</label>
     <input name="llm_endpoint" value="{{ form.llm_endpoint }}">
     <label>LLM Token (not stored)</label>
@@ -119,115 +157,492 @@ TEMPLATE = """
       <pre>{{ result }}</pre>
     </div>
   {% endif %}
+  <div class="error" id="stream-error"></div>
+  <div class="card" id="stream-card" hidden>
+    <h2>Result</h2>
+    <pre id="stream-output"></pre>
+  </div>
+  <script>
+    // Progressive enhancement: stream the review from /stream; without JS the form posts normally.
+    (function () {
+      var form = document.querySelector("form");
+      if (!window.fetch || !window.TextDecoder || !window.FormData) { return; }
+      form.addEventListener("submit", function (ev) {
+        ev.preventDefault();
+        var out = document.getElementById("stream-output");
+        var err = document.getElementById("stream-error");
+        out.textContent = "";
+        err.textContent = "";
+        document.getElementById("stream-card").hidden = false;
+        fetch("stream", { method: "POST", body: new FormData(form) }).then(function (resp) {
+          if (!resp.ok) {
+            document.getElementById("stream-card").hidden = true;
+            err.textContent = "Request failed: " + resp.status + " " + resp.statusText;
+            return;
+          }
+          var reader = resp.body.getReader();
+          var decoder = new TextDecoder();
+          var buffer = "";
+          function handle(block) {
+            var event = "message";
+            var data = "";
+            block.split("\\n").forEach(function (line) {
+              if (line.indexOf("event: ") === 0) { event = line.slice(7); }
+              else if (line.indexOf("data: ") === 0) { data += line.slice(6); }
+            });
+            if (!data) { return; }
+            if (event === "error") { err.textContent = JSON.parse(data); }
+            else if (event === "message") { out.textContent += JSON.parse(data); }
+          }
+          function pump() {
+            return reader.read().then(function (chunk) {
+              if (chunk.done) { return; }
+              buffer += decoder.decode(chunk.value, { stream: true });
+              var events = buffer.split("\\n\\n");
+              buffer = events.pop();
+              events.forEach(handle);
+              return pump();
+            });
+          }
+          return pump();
+        }).catch(function (exc) { err.textContent = "Streaming failed: " + exc; });
+      });
+    })();
+  </script>
 </body>
 </html>
 """
 
+# Compiled once at import; the bytecode cache also spares the compile on restarts.
+_ENV = Environment(
+    loader=DictLoader({"index.html": TEMPLATE}),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+_ENV.globals.update(
+    AUDIENCES=("researcher", "student", "industry", "general"),
+    MODES=(("timeline", "Timeline"), ("school", "School"), ("application", "Application"), ("custom", "Custom")),
+    LANGS=("zh", "en"),
+    PROVIDERS=("local", "huggingface", "openai", "deepseek"),
+)
+_TMPL = _ENV.get_template("index.html")
+
+_DEFAULTS = {
+    "topic": "多模态大模型",
+    "audience": "researcher",
+    "mode": "timeline",
+    "length": "1500",
+    "keywords": "LLM,benchmark,alignment",
+    "outline": "",
+    "lang": "zh",
+    "sources_text": "",
+    "llm": "local",
+    "llm_model": "",
+    "llm_timeout": "8",
+    "llm_endpoint": "",
+    "max_output_tokens": "",
+    "max_retries": "3",
+}
+# The landing page only depends on the static defaults, so render it once.
+_DEFAULT_GET_BODY = _TMPL.render(form=_DEFAULTS, result=None, error=None).encode("utf-8")
+_DEFAULT_GET_GZIP = gzip.compress(_DEFAULT_GET_BODY, mtime=0)
+_DEFAULT_GET_ETAG = hashlib.blake2b(_DEFAULT_GET_BODY, digest_size=16).hexdigest()
+
+
+def _clean_upload(f: FileStorage) -> str:
+    """Decode and clean an uploaded file line by line instead of reading it whole.
+
+    Werkzeug already spools large parts to a temporary file, so only one line
+    of raw text is held in memory at a time. The byte lines are decoded directly
+    because SpooledTemporaryFile cannot be wrapped in io.TextIOWrapper before
+    Python 3.11.
+    """
+    lines = (basic_clean(raw.decode("utf-8", "replace")) for raw in f.stream)
+    return " ".join(line for line in lines if line)
+
+
+def _upload_size(f: FileStorage) -> int:
+    """Remaining byte size of an upload; multipart parts rarely carry a Content-Length."""
+    if f.content_length:
+        return f.content_length
+    stream = f.stream
+    pos = stream.tell()
+    end = stream.seek(0, io.SEEK_END)
+    stream.seek(pos)
+    return end - pos
+
 
 def _collect_sources_from_form(req) -> tuple[list[str], list[str]]:
     """Collect source texts and names from form."""
     texts: List[str] = []
     names: List[str] = []
 
-    pasted = req.form.get("sources_text", "").splitlines()
-    for idx, line in enumerate(pasted, start=1):
-        cleaned = basic_clean(line)
-        if cleaned:
-            texts.append(cleaned)
-            names.append(f"pasted_{idx}.txt")
+    pasted = basic_clean_bulk(req.form.get("sources_text", ""))
+    texts.extend(pasted)
+    names.extend(f"pasted_{idx}.txt" for idx in range(1, len(pasted) + 1))
 
     files = req.files.getlist("sources_files")
     for f in files:
         try:
-            content = f.read().decode("utf-8")
+            if _upload_size(f) > _MAX_FILE_BYTES:
+                continue
+            cleaned = _clean_upload(f)
         except Exception:
             continue
-        cleaned = basic_clean(content)
         if cleaned:
             texts.append(cleaned)
             names.append(f.filename or f"upload_{len(names)+1}.txt")
 
-    # Deduplicate texts while keeping aligned names.
-    seen = set()
-    unique_texts: List[str] = []
-    unique_names: List[str] = []
-    for text, name in zip(texts, names):
-        if text not in seen:
-            seen.add(text)
-            unique_texts.append(text)
-            unique_names.append(name)
-    return unique_texts, unique_names
+    # Deduplicate texts while keeping aligned names: record the indices to keep,
+    # then build both output lists once.
+    seen: set[bytes] = set()
+    keep: List[int] = []
+    for idx, text in enumerate(texts):
+        key = fingerprint(text)
+        if key not in seen:
+            seen.add(key)
+            keep.append(idx)
+    return [texts[i] for i in keep], [names[i] for i in keep]
+
+
+# Rendered reviews by _result_key, kept for an hour.
+_RESULTS: LRUCache[str] = LRUCache(maxsize=256, ttl=3600.0)
+
+# Worker processes for the local provider; 0 (the default) generates inline, which
+# is cheaper than pickling the sources across for typical inputs.
+_LOCAL_WORKERS = int(os.getenv("REVIEWGEN_LOCAL_WORKERS", "0") or 0)
+_LOCAL_POOL: Optional[ProcessPoolExecutor] = None
+_LOCAL_POOL_LOCK = threading.Lock()
+
+
+def _local_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for local-provider requests, created on first use; None when disabled."""
+    global _LOCAL_POOL
+    if _LOCAL_WORKERS <= 0:
+        return None
+    with _LOCAL_POOL_LOCK:
+        if _LOCAL_POOL is None:
+            # Created from a server thread: fork here could copy locks held by other threads.
+            _LOCAL_POOL = ProcessPoolExecutor(
+                max_workers=_LOCAL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _LOCAL_POOL
+
+
+def _token_hash(token: Optional[str]) -> str:
+    """Digest standing in for an LLM token in cache keys."""
+    return hashlib.blake2b((token or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _result_key(
+    form, *, length: int, keywords: List[str], outline: List[str], sources: List[str], names: List[str]
+) -> str:
+    """Hash every input that affects the rendered review.
+
+    The LLM token enters only as a hash, so a cached LLM review is never served
+    to a request whose own token is missing or invalid.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    parts = [
+        date.today().isoformat(),
+        form.get("topic", ""),
+        form.get("audience", "general"),
+        str(length),
+        form.get("mode", "timeline"),
+        form.get("lang", "zh"),
+        form.get("llm", "local"),
+        form.get("llm_model", ""),
+        form.get("llm_endpoint", ""),
+        form.get("max_output_tokens", ""),
+        _token_hash(form.get("llm_token")),
+        *keywords,
+        "\0",
+        *outline,
+        "\0",
+        *names,
+    ]
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for text in sources:
+        h.update(fingerprint(text))
+    return h.hexdigest()
+
+
+def _request_options(form) -> Tuple[int, int, int, List[str]]:
+    """Parse (length, llm_timeout, max_retries, keywords) from the submitted form."""
+    try:
+        length = int(form.get("length", "1500") or 1500)
+    except ValueError:
+        length = 1500
+
+    try:
+        llm_timeout = min(max(1, int(form.get("llm_timeout", "8") or 8)), _MAX_LLM_TIMEOUT)
+    except ValueError:
+        llm_timeout = 8
+
+    try:
+        max_retries = min(max(0, int(form.get("max_retries", "3") or 3)), _MAX_LLM_RETRIES)
+    except ValueError:
+        max_retries = 3
+
+    keywords = [k.strip() for k in form.get("keywords", "").split(",") if k.strip()]
+    return length, llm_timeout, max_retries, keywords
+
+
+# Evicted clients close their sessions so pooled sockets don't linger until GC.
+_CLIENTS: LRUCache[LLMClient] = LRUCache(maxsize=32, on_evict=lambda client: client.close())
+
+
+def _cached_llm_client(provider: str, *, token: Optional[str], **options) -> LLMClient:
+    """``build_llm_client`` with reuse, so repeat requests keep the client's pooled connections.
+
+    The key holds a hash of the token rather than the token itself, and keeps
+    clients for different tokens apart.
+    """
+    key = (provider, _token_hash(token), *sorted(options.items()))
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+    built = build_llm_client(provider, token=token, **options)
+    client = _CLIENTS.setdefault(key, built)
+    if client is not built:
+        # Another request built the same client first.
+        built.close()
+    return client
+
+
+def _build_client(
+    form, *, length: int, n_sections: int, llm_timeout: int, max_retries: int
+) -> Tuple[Optional[LLMClient], Optional[str]]:
+    """Build the requested LLM client; returns ``(client, error)`` and None for the local provider."""
+    try:
+        max_output_tokens = int(form.get("max_output_tokens", "") or 0)
+    except ValueError:
+        max_output_tokens = 0
+    if max_output_tokens <= 0:
+        # Spread the target length over the sections, with headroom for tokenization.
+        max_output_tokens = max(64, math.ceil(length * _TOKENS_PER_WORD / max(n_sections, 1)))
+
+    llm_provider = form.get("llm", "local")
+    if llm_provider == "local":
+        return None, None
+    try:
+        client = _cached_llm_client(
+            llm_provider,
+            endpoint=form.get("llm_endpoint") or None,
+            model=form.get("llm_model") or None,
+            token=form.get("llm_token") or None,
+            timeout=llm_timeout,
+            max_output_tokens=max_output_tokens,
+            max_retries=max_retries,
+        )
+    except Exception as exc:
+        return None, f"LLM init failed: {exc}"
+    return client, None
+
+
+def _review_kwargs(
+    form, *, length: int, keywords: List[str], outline: List[str], sources: List[str], names: List[str]
+) -> Dict[str, object]:
+    """Keyword arguments shared by ``generate_review``, ``agenerate_review`` and ``stream_review``."""
+    return dict(
+        topic=form.get("topic", ""),
+        audience=form.get("audience", "general"),
+        length=length,
+        mode=form.get("mode", "timeline"),
+        keywords=keywords,
+        outline=outline,
+        sources=sources,
+        source_names=names,
+        lang=form.get("lang", "zh"),
+    )
+
+
+async def _generate(req, form: Dict[str, str], *, length: int, keywords: List[str], llm_timeout: int, max_retries: int):
+    """Collect sources and plan the outline concurrently, then generate the review.
+
+    ``form`` is the request form flattened to a plain dict.
+
+    Returns ``(markdown, error)``; ``error`` reports an LLM init failure, in which case
+    the review falls back to the local generator.
+    """
+    mode = form.get("mode", "timeline")
+    topic = form.get("topic", "")
+    custom_outline = form.get("outline") or None
+    (sources_texts, source_names), outline = await asyncio.gather(
+        asyncio.to_thread(_collect_sources_from_form, req),
+        asyncio.to_thread(generate_outline, mode, topic, keywords, custom_outline),
+    )
+
+    cache_key = _result_key(
+        form, length=length, keywords=keywords, outline=outline, sources=sources_texts, names=source_names
+    )
+    cached = _RESULTS.get(cache_key)
+    if cached is not None:
+        return cached, None
+
+    llm_client, error = _build_client(
+        form, length=length, n_sections=len(outline), llm_timeout=llm_timeout, max_retries=max_retries
+    )
+
+    review_kwargs = _review_kwargs(
+        form, length=length, keywords=keywords, outline=outline, sources=sources_texts, names=source_names
+    )
+    fallbacks: List[str] = []
+    pool = _local_pool() if llm_client is None else None
+    if pool is not None:
+        # Rule-based generation is CPU work; run it outside this process's GIL.
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(pool, functools.partial(generate_review, **review_kwargs))
+    else:
+        # LLM section calls are awaited concurrently instead of one after another.
+        result = await agenerate_review(
+            **review_kwargs,
+            llm_client=llm_client,
+            # Each call may be retried, so bound the whole attempt sequence.
+            call_timeout=llm_timeout * (max_retries + 1),
+            fallbacks=fallbacks,
+        )
+    # Rule-based stand-ins for failed LLM calls must not be served on a retry.
+    if error is None and not fallbacks:
+        _RESULTS.set(cache_key, result)
+    return result, error
+
+
+def _sse(data: str, event: str = "message") -> str:
+    """Format one Server-Sent Event; data is JSON-encoded so newlines survive."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _landing_page() -> Response:
+    """Serve the prerendered form, gzipped when accepted, with an ETag for 304 revalidation."""
+    gzipped = request.accept_encodings["gzip"] > 0
+    resp = Response(_DEFAULT_GET_GZIP if gzipped else _DEFAULT_GET_BODY, mimetype="text/html")
+    if gzipped:
+        resp.content_encoding = "gzip"
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(f"{_DEFAULT_GET_ETAG}-gz" if gzipped else _DEFAULT_GET_ETAG)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 60
+    return resp.make_conditional(request)
 
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    form_defaults = {
-        "topic": request.form.get("topic", "多模态大模型"),
-        "audience": request.form.get("audience", "researcher"),
-        "mode": request.form.get("mode", "timeline"),
-        "length": request.form.get("length", "1500"),
-        "keywords": request.form.get("keywords", "LLM,benchmark,alignment"),
-        "outline": request.form.get("outline", ""),
-        "lang": request.form.get("lang", "zh"),
-        "sources_text": request.form.get("sources_text", ""),
-        "llm": request.form.get("llm", "local"),
-        "llm_model": request.form.get("llm_model", ""),
-        "llm_timeout": request.form.get("llm_timeout", "8"),
-        "llm_endpoint": request.form.get("llm_endpoint", ""),
-    }
+    if request.method == "GET":
+        return _landing_page()
+
+    # One pass over the MultiDict; every later lookup hits a plain dict.
+    fm = request.form.to_dict(flat=True)
+    form_defaults = {key: fm.get(key, default) for key, default in _DEFAULTS.items()}
     result = None
     error = None
 
-    if request.method == "POST":
-        try:
-            length = int(request.form.get("length", "1500") or 1500)
-        except ValueError:
-            length = 1500
+    length, llm_timeout, max_retries, keywords = _request_options(fm)
+    try:
+        result, error = asyncio.run(
+            _generate(
+                request._get_current_object(),
+                fm,
+                length=length,
+                keywords=keywords,
+                llm_timeout=llm_timeout,
+                max_retries=max_retries,
+            )
+        )
+    except Exception as exc:
+        error = f"Generation failed: {exc}"
+    return _TMPL.render(form=form_defaults, result=result, error=error)
 
-        try:
-            llm_timeout = int(request.form.get("llm_timeout", "8") or 8)
-        except ValueError:
-            llm_timeout = 8
-
-        keywords = [k.strip() for k in request.form.get("keywords", "").split(",") if k.strip()]
-        sources_texts, source_names = _collect_sources_from_form(request)
-
-        llm_provider = request.form.get("llm", "local")
-        llm_token = request.form.get("llm_token") or None
-        llm_model = request.form.get("llm_model") or None
-        llm_endpoint = request.form.get("llm_endpoint") or None
-        llm_client = None
-        if llm_provider != "local":
-            try:
-                llm_client = build_llm_client(
-                    llm_provider, endpoint=llm_endpoint, model=llm_model, token=llm_token, timeout=llm_timeout
-                )
-            except Exception as exc:
-                error = f"LLM init failed: {exc}"
 
+@app.errorhandler(413)
+def request_too_large(exc):
+    limit_mb = app.config["MAX_CONTENT_LENGTH"] / (1024 * 1024)
+    error = f"Request too large: uploads are limited to {limit_mb:g} MB in total."
+    return _TMPL.render(form=_DEFAULTS, result=None, error=error), 413
+
+
+@app.route("/stream", methods=["POST"])
+def stream():
+    """Same form as ``index``, answered as Server-Sent Events carrying the review piece by piece.
+
+    Shares the result cache and the local-provider process pool with ``index``; those
+    results arrive as a single event.
+    """
+    form = request.form.to_dict(flat=True)
+    length, llm_timeout, max_retries, keywords = _request_options(form)
+    sources_texts, source_names = _collect_sources_from_form(request)
+
+    def review_events() -> Iterator[str]:
         outline = generate_outline(
-            request.form.get("mode", "timeline"),
-            request.form.get("topic", ""),
-            keywords,
-            request.form.get("outline") or None,
+            form.get("mode", "timeline"), form.get("topic", ""), keywords, form.get("outline") or None
         )
-        try:
-            result = plan_and_generate(
-                topic=request.form.get("topic", ""),
-                audience=request.form.get("audience", "general"),
-                length=length,
-                mode=request.form.get("mode", "timeline"),
-                keywords=keywords,
-                custom_outline=request.form.get("outline") or None,
-                sources=sources_texts,
-                source_names=source_names,
-                lang=request.form.get("lang", "zh"),
+        cache_key = _result_key(
+            form, length=length, keywords=keywords, outline=outline, sources=sources_texts, names=source_names
+        )
+        cached = _RESULTS.get(cache_key)
+        if cached is not None:
+            yield _sse(cached)
+            return
+
+        llm_client, error = _build_client(
+            form, length=length, n_sections=len(outline), llm_timeout=llm_timeout, max_retries=max_retries
+        )
+        if error:
+            yield _sse(error, event="error")
+        review_kwargs = _review_kwargs(
+            form, length=length, keywords=keywords, outline=outline, sources=sources_texts, names=source_names
+        )
+        fallbacks: List[str] = []
+        pool = _local_pool() if llm_client is None else None
+        if pool is not None:
+            result = pool.submit(generate_review, **review_kwargs).result()
+            yield _sse(result)
+        else:
+            parts: List[str] = []
+            for chunk in stream_review(
+                **review_kwargs,
                 llm_client=llm_client,
-            )
+                call_timeout=llm_timeout * (max_retries + 1),
+                fallbacks=fallbacks,
+            ):
+                parts.append(chunk)
+                yield _sse(chunk)
+            result = "".join(parts)
+        if error is None and not fallbacks:
+            _RESULTS.set(cache_key, result)
+
+    def events() -> Iterator[str]:
+        try:
+            yield from review_events()
         except Exception as exc:
-            error = error or f"Generation failed: {exc}"
-    return render_template_string(TEMPLATE, form=form_defaults, result=result, error=error)
+            yield _sse(f"Generation failed: {exc}", event="error")
+        yield _sse("", event="done")
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def main() -> None:
+    """Serve on 127.0.0.1:5000 with waitress when installed, else Flask's dev server.
+
+    Both handle requests on threads of a single process, so the LLM call limiter and
+    the result/client caches are shared by every request.
+    """
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    if serve is not None:
+        serve(app, host="127.0.0.1", port=5000, threads=int(os.getenv("REVIEWGEN_THREADS", "16")))
+    else:
+        app.run(debug=True, threaded=True)
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    main()